@@ -24,6 +24,8 @@ ActType = TypeVar("ActType")
 
 
 class Env(abc.ABC):
+    # Empty so that subclasses declaring their own __slots__ drop __dict__.
+    __slots__ = ()
 
     @abc.abstractmethod
     def step(
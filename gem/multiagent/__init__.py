@@ -12,9 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from gem.multiagent.multi_agent_env import AgentSelector, MultiAgentEnv
+from gem.multiagent.multi_agent_env import (
+    AgentSelector,
+    MultiAgentEnv,
+    StringActionAdapter,
+)
+from gem.multiagent.vector_multi_agent_env import (
+    AsyncVectorMultiAgentEnv,
+    SubprocVectorMultiAgentEnv,
+    SyncVectorMultiAgentEnv,
+    VectorMultiAgentEnv,
+)
 
 __all__ = [
     "MultiAgentEnv",
     "AgentSelector",
+    "StringActionAdapter",
+    "VectorMultiAgentEnv",
+    "SyncVectorMultiAgentEnv",
+    "AsyncVectorMultiAgentEnv",
+    "SubprocVectorMultiAgentEnv",
 ]
@@ -0,0 +1,105 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""On-device stepping of batched multi-agent environments.
+
+Requires ``numba`` with CUDA support (or ``NUMBA_ENABLE_CUDASIM=1`` to run the
+kernels on the CPU simulator); this module is not imported by
+:mod:`gem.multiagent`.
+"""
+
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from numba import cuda
+
+from gem.core import Env
+
+THREADS_PER_BLOCK = 128
+
+
+class CudaMultiAgentEnv(Env):
+    """Steps ``num_envs`` copies of a multi-agent env in a single kernel launch.
+
+    All per-agent data lives on the GPU as numba device arrays: ``state`` has
+    shape ``(num_envs, num_agents, state_dim)`` and ``rewards``,
+    ``terminations`` and ``truncations`` have shape ``(num_envs, num_agents)``.
+    Any array exposing ``__cuda_array_interface__`` (e.g. ``cupy``) can be
+    passed as actions. Subclasses set ``_step_kernel`` to a ``numba.cuda.jit``
+    kernel with the signature
+    ``(actions, state_in, state_out, rewards, terminations, truncations)`` that
+    handles one env per thread, e.g.::
+
+        @cuda.jit
+        def _kernel(actions, state_in, state_out, rewards, terminations, truncations):
+            env = cuda.grid(1)
+            if env < actions.shape[0]:
+                for agent in range(actions.shape[1]):
+                    ...
+
+        class MyEnv(CudaMultiAgentEnv):
+            _step_kernel = _kernel
+    """
+
+    _step_kernel: Any = None
+
+    def __init__(self, num_envs: int, num_agents: int, state_dim: int = 1):
+        super().__init__()
+        # Look the kernel up on the class: numba dispatchers bind like methods.
+        self._kernel = type(self)._step_kernel
+        if self._kernel is None:
+            raise NotImplementedError(
+                f"{type(self).__name__} must define a CUDA `_step_kernel`"
+            )
+        self.num_envs = num_envs
+        self.num_agents = num_agents
+        self.state_dim = state_dim
+
+        shape = (num_envs, num_agents)
+        self.state = cuda.to_device(np.zeros(shape + (state_dim,), dtype=np.float32))
+        self._next_state = cuda.device_array_like(self.state)
+        self.rewards = cuda.to_device(np.zeros(shape, dtype=np.float32))
+        self.terminations = cuda.to_device(np.zeros(shape, dtype=np.bool_))
+        self.truncations = cuda.to_device(np.zeros(shape, dtype=np.bool_))
+        self._blocks = (num_envs + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+
+    def init_state(self, seed: Optional[int] = None) -> np.ndarray:
+        """Returns the initial host ``state``; override for non-zero starts."""
+        return np.zeros(self.state.shape, dtype=np.float32)
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[Any, dict]:
+        super().reset(seed)
+        shape = (self.num_envs, self.num_agents)
+        self.state.copy_to_device(self.init_state(seed))
+        self.rewards.copy_to_device(np.zeros(shape, dtype=np.float32))
+        self.terminations.copy_to_device(np.zeros(shape, dtype=np.bool_))
+        self.truncations.copy_to_device(np.zeros(shape, dtype=np.bool_))
+        return self.state, {}
+
+    def step(self, actions: Any) -> Tuple[Any, Any, Any, Any, dict]:
+        """Advances every env by one step; ``actions`` is ``(num_envs, num_agents)``.
+
+        Returns ``(state, rewards, terminations, truncations, info)``. The arrays
+        are the env's device buffers and are overwritten by the next step.
+        """
+        self._kernel[self._blocks, THREADS_PER_BLOCK](
+            actions,
+            self.state,
+            self._next_state,
+            self.rewards,
+            self.terminations,
+            self.truncations,
+        )
+        self.state, self._next_state = self._next_state, self.state
+        return self.state, self.rewards, self.terminations, self.truncations, {}
@@ -0,0 +1,182 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pure-functional multi-agent environments with jittable JAX rollouts.
+
+Requires ``jax``; this module is not imported by :mod:`gem.multiagent`.
+"""
+
+import abc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from gem.multiagent.multi_agent_env import MultiAgentEnv
+
+PyTree = Any
+Transition = Tuple[PyTree, jax.Array, jax.Array, jax.Array, PyTree]
+
+
+class FunctionalMultiAgentEnv(abc.ABC):
+    """Multi-agent env expressed as pure ``reset_fn``/``step_fn`` JAX functions.
+
+    Per-agent quantities are arrays with a leading ``num_agents`` axis, indexed
+    like ``possible_agents``, so both functions can be traced by ``jax.jit``,
+    batched with ``jax.vmap`` and unrolled with ``jax.lax.scan``.
+    """
+
+    possible_agents: Tuple[str, ...] = ()
+
+    @property
+    def num_agents(self) -> int:
+        return len(self.possible_agents)
+
+    @abc.abstractmethod
+    def reset_fn(self, key: jax.Array) -> Tuple[PyTree, PyTree]:
+        """Returns the initial ``(state, observations)`` for a PRNG key."""
+
+    @abc.abstractmethod
+    def step_fn(
+        self, state: PyTree, actions: jax.Array
+    ) -> Tuple[PyTree, PyTree, jax.Array, jax.Array, jax.Array, PyTree]:
+        """Returns ``(state, observations, rewards, terminations, truncations, info)``."""
+
+
+def build_rollout(
+    env: FunctionalMultiAgentEnv,
+    num_steps: int,
+    policy_fn: Callable[[jax.Array, PyTree], jax.Array],
+    autoreset: bool = True,
+) -> Callable[[jax.Array], Tuple[PyTree, Transition]]:
+    """Builds a jitted ``rollout(key)`` running ``num_steps`` with ``jax.lax.scan``.
+
+    ``policy_fn(key, observations)`` returns the ``(num_agents,)`` actions. The
+    rollout returns the final state and the stacked ``(observations, rewards,
+    terminations, truncations, info)`` transitions, each with a leading
+    ``num_steps`` axis. Use :func:`build_batched_rollout` to run many seeds.
+
+    With ``autoreset`` the env is reset once every agent is terminated or
+    truncated: that step still records the final observations, and the next
+    step starts from ``reset_fn``. Agents that finish while others keep playing
+    are still passed to ``step_fn``, which must mask them itself. Without
+    ``autoreset`` the env keeps stepping past the end of the episode.
+    """
+
+    def rollout(key: jax.Array) -> Tuple[PyTree, Transition]:
+        reset_key, key = jax.random.split(key)
+        state, obs = env.reset_fn(reset_key)
+
+        def _step(carry, step_key):
+            state, obs = carry
+            policy_key, reset_key = jax.random.split(step_key)
+            actions = policy_fn(policy_key, obs)
+            state, obs, rewards, terminations, truncations, info = env.step_fn(
+                state, actions
+            )
+            transition = (obs, rewards, terminations, truncations, info)
+            if autoreset:
+                done = jnp.all(terminations | truncations)
+                reset_state, reset_obs = env.reset_fn(reset_key)
+                state, obs = jax.tree_util.tree_map(
+                    lambda new, old: jnp.where(done, new, old),
+                    (reset_state, reset_obs),
+                    (state, obs),
+                )
+            return (state, obs), transition
+
+        (state, _), transitions = jax.lax.scan(
+            _step, (state, obs), jax.random.split(key, num_steps)
+        )
+        return state, transitions
+
+    return jax.jit(rollout)
+
+
+def build_batched_rollout(
+    env: FunctionalMultiAgentEnv,
+    num_steps: int,
+    policy_fn: Callable[[jax.Array, PyTree], jax.Array],
+    autoreset: bool = True,
+) -> Callable[[jax.Array], Tuple[PyTree, Transition]]:
+    """Same as :func:`build_rollout`, vmapped over a ``(num_envs, ...)`` key batch."""
+    return jax.jit(jax.vmap(build_rollout(env, num_steps, policy_fn, autoreset)))
+
+
+class FunctionalEnvAdapter(MultiAgentEnv):
+    """Exposes a :class:`FunctionalMultiAgentEnv` through the dict-based API.
+
+    Actions must be numeric; observations are per-agent slices of the functional
+    env's observation array.
+    """
+
+    def __init__(self, env: FunctionalMultiAgentEnv, seed: int = 0):
+        super().__init__()
+        self.functional_env = env
+        self.possible_agents = list(env.possible_agents)
+        self._key = jax.random.PRNGKey(seed)
+        self._reset_fn = jax.jit(env.reset_fn)
+        self._step_fn = jax.jit(env.step_fn)
+        self._env_state: Optional[PyTree] = None
+        self._obs: Optional[np.ndarray] = None
+
+    def reset(
+        self, seed: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        if seed is not None:
+            self._key = jax.random.PRNGKey(seed)
+        self._key, reset_key = jax.random.split(self._key)
+        self._env_state, obs = self._reset_fn(reset_key)
+        self._obs = np.asarray(obs)
+        return super().reset(seed)
+
+    def observe(self, agent: str) -> Any:
+        return self._obs[self._agent_to_idx[agent]]
+
+    def _process_actions(self, actions: Dict[str, Any]) -> Tuple[
+        Dict[str, Any],
+        Dict[str, float],
+        Dict[str, bool],
+        Dict[str, bool],
+        Dict[str, dict],
+    ]:
+        # Agents without an action this step (e.g. sequential mode) get 0.
+        action_arr = np.zeros(self.functional_env.num_agents, dtype=np.int32)
+        for agent, action in actions.items():
+            action_arr[self._agent_to_idx[agent]] = action
+
+        self._env_state, obs, rewards, terminations, truncations, _ = self._step_fn(
+            self._env_state, jnp.asarray(action_arr)
+        )
+        self._obs = np.asarray(obs)
+        rewards, terminations, truncations = (
+            np.asarray(rewards).tolist(),
+            np.asarray(terminations).tolist(),
+            np.asarray(truncations).tolist(),
+        )
+
+        agent_idx = self._agent_to_idx
+        observations = {agent: self.observe(agent) for agent in actions}
+        step_rewards = {agent: rewards[agent_idx[agent]] for agent in actions}
+        for agent in self.agents:
+            self.terminations[agent] = terminations[agent_idx[agent]]
+            self.truncations[agent] = truncations[agent_idx[agent]]
+        return (
+            observations,
+            step_rewards,
+            dict(self.terminations),
+            dict(self.truncations),
+            self.infos,
+        )
@@ -13,39 +13,108 @@
 # limitations under the License.
 
 import abc
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
-from gem.core import Env
+import numpy as np
 
+from gem.core import Env, EnvWrapper
+from gem.vector.vector_env import AutoresetMode
+
+ActionType = Union[str, int]
+StepKernel = Callable[[np.ndarray, Any], Tuple[np.ndarray, np.ndarray]]
 
-class MultiAgentEnv(Env):
 
-    def __init__(self):
+class MultiAgentEnv(Env):
+    __slots__ = (
+        "_possible_agents",
+        "agents",
+        "_agents_set",
+        "_agent_to_idx",
+        "terminations",
+        "truncations",
+        "rewards",
+        "infos",
+        "_cumulative_rewards",
+        "_false_template",
+        "_true_template",
+        "agent_selector",
+        "shared_memory",
+        "global_context",
+        "autoreset_mode",
+        "_autoreset_pending",
+    )
+
+    # Optional ``(actions_arr, state_arr) -> (rewards, terminations)`` kernel,
+    # e.g. a ``numba.njit`` function; see :meth:`_run_step_kernel`.
+    _step_kernel: Optional[StepKernel] = None
+
+    def __init__(
+        self, autoreset_mode: Optional[Union[str, AutoresetMode]] = None
+    ) -> None:
+        """Initializes the per-agent state.
+
+        Args:
+            autoreset_mode: Reset automatically once all agents are done; ``None``
+                disables it. With ``SAME_STEP`` the finishing step returns the reset
+                observations/infos and stashes the final ones under
+                ``infos["__final__"]``; with ``NEXT_STEP`` the following
+                :meth:`step` resets and ignores its actions.
+        """
         super().__init__()
+        self.autoreset_mode = (
+            None if autoreset_mode is None else AutoresetMode(autoreset_mode)
+        )
+        self._autoreset_pending = False
 
-        self.possible_agents: List[str] = []
+        self._possible_agents: List[str] = []
         self.agents: List[str] = []
+        self._agents_set: Set[str] = set()
+        self._agent_to_idx: Dict[str, int] = {}
+        self.possible_agents = []
 
         self.terminations: Dict[str, bool] = {}
         self.truncations: Dict[str, bool] = {}
         self.rewards: Dict[str, float] = {}
         self.infos: Dict[str, dict] = {}
         self._cumulative_rewards: Dict[str, float] = {}
+        self._false_template: Dict[str, bool] = {}
+        self._true_template: Dict[str, bool] = {}
 
         self.agent_selector: Optional["AgentSelector"] = None
 
         self.shared_memory = []
         self.global_context = ""
 
-    def step(self, actions: Dict[str, str]) -> Tuple[
+    def step(self, actions: Union[Dict[str, ActionType], np.ndarray]) -> Tuple[
         Dict[str, str],
         Dict[str, float],
         Dict[str, bool],
         Dict[str, bool],
         Dict[str, dict],
     ]:
-        if not isinstance(actions, dict):
-            raise ValueError(f"Actions must be a dict, got {type(actions)}")
+        """Steps the active agents.
+
+        ``actions`` maps agent names to actions, or is an integer array indexed by
+        agent slot (the position in ``possible_agents``), of which only the
+        active agents' entries are used. Agents added with :meth:`add_agent` have
+        no slot, so they need dict actions.
+        """
+        if not isinstance(actions, (dict, np.ndarray)):
+            raise ValueError(
+                f"Actions must be a dict or np.ndarray, got {type(actions)}"
+            )
+
+        if self._autoreset_pending:
+            observations, infos = self.reset()
+            return (
+                observations,
+                dict.fromkeys(self.agents, 0.0),
+                self._false_template.copy(),
+                self._false_template.copy(),
+                infos,
+            )
 
         active_agents = (
             self.agent_selector.get_active_agents()
@@ -53,6 +122,28 @@ class MultiAgentEnv(Env):
             else self.agents
         )
 
+        if isinstance(actions, np.ndarray):
+            if not np.issubdtype(actions.dtype, np.integer):
+                raise ValueError(
+                    f"Array actions must have an integer dtype, got {actions.dtype}"
+                )
+            num_slots = len(self.possible_agents)
+            if actions.shape != (num_slots,):
+                raise ValueError(
+                    f"Array actions must have shape ({num_slots},), "
+                    f"got {actions.shape}"
+                )
+            codes = actions.tolist()
+            agent_to_idx = self._agent_to_idx
+            try:
+                actions = {agent: codes[agent_to_idx[agent]] for agent in active_agents}
+            except KeyError as e:
+                # Agents added at runtime are not in possible_agents.
+                raise ValueError(
+                    f"Agent {e.args[0]} has no slot in possible_agents; "
+                    "pass its action in a dict"
+                ) from None
+
         self._validate_actions(actions, active_agents)
 
         observations, rewards, terminations, truncations, infos = self._process_actions(
@@ -65,28 +156,90 @@ class MultiAgentEnv(Env):
                     self._cumulative_rewards.get(agent, 0.0) + rewards[agent]
                 )
 
+        # Dead agents' infos are deleted below; keep them for the final step.
+        final_infos = (
+            dict(infos) if self.autoreset_mode == AutoresetMode.SAME_STEP else None
+        )
         self._remove_dead_agents()
 
         if self.agent_selector:
             self.agent_selector.next()
 
+        if self.autoreset_mode is not None and not self.agents:
+            if self.autoreset_mode == AutoresetMode.SAME_STEP:
+                final = {"observation": dict(observations), "info": final_infos}
+                observations, infos = self.reset()
+                infos["__final__"] = final
+            else:
+                self._autoreset_pending = True
+
         return observations, rewards, terminations, truncations, infos
 
-    def _validate_actions(self, actions: Dict[str, str], active_agents: List[str]):
-        for agent in active_agents:
-            if agent not in self.terminations or self.terminations[agent]:
-                continue
-            if agent not in self.truncations or self.truncations[agent]:
-                continue
-            if agent not in actions:
-                raise ValueError(f"Missing action for active agent {agent}")
+    def step_copy(self, actions: Union[Dict[str, ActionType], np.ndarray]) -> Tuple[
+        Dict[str, str],
+        Dict[str, float],
+        Dict[str, bool],
+        Dict[str, bool],
+        Dict[str, dict],
+    ]:
+        """Same as :meth:`step`, but returns fresh copies of the output dicts.
+
+        Subclasses may reuse the dicts returned by :meth:`step` across steps, so
+        they are only valid until the next call; use this to keep them longer.
+        """
+        observations, rewards, terminations, truncations, infos = self.step(actions)
+        return (
+            dict(observations),
+            dict(rewards),
+            dict(terminations),
+            dict(truncations),
+            {agent: dict(info) for agent, info in infos.items()},
+        )
 
-        for agent in actions:
-            if agent not in active_agents:
-                raise ValueError(f"Agent {agent} provided action but is not active")
+    def _validate_actions(
+        self, actions: Dict[str, ActionType], active_agents: List[str]
+    ):
+        # The parallel AgentSelector hands out a copy of the agent list; a list
+        # compare is allocation-free, so reuse the cached set whenever it matches.
+        active_set = (
+            self._agents_set if active_agents == self.agents else set(active_agents)
+        )
+        action_agents = actions.keys()
+        if action_agents == active_set:
+            return
+
+        # Mismatch: only now pay for the set differences and error messages.
+        missing = [
+            agent
+            for agent in active_set - action_agents
+            if not (
+                self.terminations.get(agent, True) or self.truncations.get(agent, True)
+            )
+        ]
+        if missing:
+            raise ValueError(
+                f"Missing action for active agent {', '.join(sorted(missing))}"
+            )
+
+        extra = action_agents - active_set
+        if extra:
+            raise ValueError(
+                f"Agent {', '.join(sorted(extra))} provided action but is not active"
+            )
+
+    @property
+    def possible_agents(self) -> List[str]:
+        return self._possible_agents
+
+    @possible_agents.setter
+    def possible_agents(self, agents: List[str]):
+        # Intern agent names so dict lookups on them hit the identity fast path,
+        # and give each a stable slot for array-backed per-agent state.
+        self._possible_agents = [sys.intern(agent) for agent in agents]
+        self._agent_to_idx = {agent: i for i, agent in enumerate(self._possible_agents)}
 
     @abc.abstractmethod
-    def _process_actions(self, actions: Dict[str, str]) -> Tuple[
+    def _process_actions(self, actions: Dict[str, ActionType]) -> Tuple[
         Dict[str, str],
         Dict[str, float],
         Dict[str, bool],
@@ -95,28 +248,64 @@ class MultiAgentEnv(Env):
     ]:
         raise NotImplementedError
 
+    def _kernel_state(self) -> Any:
+        """Returns the ``state_arr`` passed to ``_step_kernel``; ``None`` by default."""
+        return None
+
+    def _run_step_kernel(
+        self,
+        actions: Dict[str, int],
+        rewards: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        """Runs ``_step_kernel`` on integer ``actions`` packed into an array.
+
+        The kernel gets the codes in ``actions`` order plus :meth:`_kernel_state`
+        and returns per-agent reward and termination arrays in the same order.
+        Terminations are applied to ``self.terminations``; rewards are written
+        into ``rewards`` (a new dict if ``None``), which is returned. Subclasses
+        call this from :meth:`_process_actions`.
+        """
+        # Look the kernel up on the class: numba dispatchers bind like methods.
+        kernel = type(self)._step_kernel
+        if kernel is None:
+            raise NotImplementedError(f"{type(self).__name__} has no `_step_kernel`")
+
+        agents = list(actions)
+        codes = np.fromiter(actions.values(), dtype=np.int64, count=len(agents))
+        rewards_arr, terminations_arr = kernel(codes, self._kernel_state())
+
+        if rewards is None:
+            rewards = {}
+        rewards.update(zip(agents, rewards_arr.tolist()))
+        for idx in np.flatnonzero(terminations_arr):
+            self.terminations[agents[idx]] = True
+        return rewards
+
     def reset(
         self, seed: Optional[int] = None
     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
-        if seed is not None:
-            self._np_random = self._make_np_random(seed)
+        super().reset(seed)
 
         self.agents = self.possible_agents.copy()
+        self._agents_set = set(self.agents)
+        self._refresh_status_templates()
 
-        self.terminations = {agent: False for agent in self.agents}
-        self.truncations = {agent: False for agent in self.agents}
-        self.rewards = {agent: 0.0 for agent in self.agents}
-        self.infos = {agent: {} for agent in self.agents}
-        self._cumulative_rewards = {agent: 0.0 for agent in self.agents}
+        self.terminations = self._false_template.copy()
+        self.truncations = self._false_template.copy()
+        self.rewards = dict.fromkeys(self.agents, 0.0)
+        # Infos need a distinct dict per agent, so dict.fromkeys would alias them.
+        self.infos = dict(zip(self.agents, [{} for _ in self.agents]))
+        self._cumulative_rewards = dict.fromkeys(self.agents, 0.0)
 
         self.shared_memory = []
         self.global_context = ""
+        self._autoreset_pending = False
 
         if self.agent_selector:
             self.agent_selector.reinit(self.agents)
 
         observations = {agent: self.observe(agent) for agent in self.agents}
-        infos = {agent: {} for agent in self.agents}
+        infos = dict(zip(self.agents, [{} for _ in self.agents]))
 
         return observations, infos
 
@@ -136,6 +325,28 @@ class MultiAgentEnv(Env):
             self.infos.get(agent, {}),
         )
 
+    def state(self, copy_on_read: bool = False) -> Dict[str, Any]:
+        """Returns the global environment state, e.g. for a centralized critic.
+
+        By default the dicts are read-only views of the current status dicts and
+        change as the environment steps. A view only tracks the dict object it
+        wraps: :meth:`reset`, or a subclass assigning a new dict to e.g.
+        ``self.truncations``, leaves it stale, so subclasses should update these
+        dicts in place. Pass ``copy_on_read=True`` to get plain dict snapshots.
+        """
+        state = {
+            "agents": tuple(self.agents),
+            "terminations": MappingProxyType(self.terminations),
+            "truncations": MappingProxyType(self.truncations),
+            "cumulative_rewards": MappingProxyType(self._cumulative_rewards),
+        }
+        if copy_on_read:
+            state = {
+                key: value if isinstance(value, tuple) else dict(value)
+                for key, value in state.items()
+            }
+        return state
+
     def get_active_states(self) -> Dict[str, Tuple[str, float, bool, bool, dict]]:
         active_agents = (
             self.agent_selector.get_active_agents()
@@ -154,6 +365,8 @@ class MultiAgentEnv(Env):
             return
 
         self.agents.append(agent_id)
+        self._agents_set.add(agent_id)
+        self._refresh_status_templates()
         self.terminations[agent_id] = False
         self.truncations[agent_id] = False
         self.rewards[agent_id] = 0.0
@@ -168,6 +381,11 @@ class MultiAgentEnv(Env):
             return
 
         self.agents.remove(agent_id)
+        self._agents_set.discard(agent_id)
+        self._refresh_status_templates()
+        self._drop_agent_state(agent_id)
+
+    def _drop_agent_state(self, agent_id: str):
         del self.terminations[agent_id]
         del self.truncations[agent_id]
         del self.rewards[agent_id]
@@ -178,13 +396,31 @@ class MultiAgentEnv(Env):
             self.agent_selector.remove_agent(agent_id)
 
     def _remove_dead_agents(self):
-        dead_agents = [
-            agent
-            for agent in self.agents
-            if self.terminations.get(agent, False) or self.truncations.get(agent, False)
-        ]
+        terminations, truncations = self.terminations, self.truncations
+        # Fast path: nobody is done, so skip the per-agent lookups entirely.
+        if not (any(terminations.values()) or any(truncations.values())):
+            return
+
+        alive_agents, dead_agents = [], []
+        for agent in self.agents:
+            if terminations.get(agent, False) or truncations.get(agent, False):
+                dead_agents.append(agent)
+            else:
+                alive_agents.append(agent)
+        if not dead_agents:
+            return
+
+        self.agents = alive_agents
+        self._agents_set = set(alive_agents)
+        self._refresh_status_templates()
         for agent in dead_agents:
-            self.remove_agent(agent)
+            self._drop_agent_state(agent)
+
+    def _refresh_status_templates(self):
+        # Constant all-False / all-True status dicts for the current agents.
+        # Copy them before writing: subclasses mutate the live status dicts.
+        self._false_template = dict.fromkeys(self.agents, False)
+        self._true_template = dict.fromkeys(self.agents, True)
 
     def send_message(self, from_agent: str, to_agent: str, message: str):
         if from_agent not in self.agents:
@@ -256,3 +492,69 @@ class AgentSelector:
             else:
                 self._current_idx = 0
                 self.selected = None
+
+
+def _forward_to_env(name: str) -> property:
+    return property(lambda self: getattr(self.env, name))
+
+
+class StringActionAdapter(EnvWrapper):
+    """Translates string actions into a wrapped env's integer action codes.
+
+    The lookup happens once per action at ingress, so the wrapped env can work
+    with integer codes (e.g. as indices into reward tables) only.
+    """
+
+    def __init__(
+        self,
+        env: MultiAgentEnv,
+        action_codes: Dict[str, int],
+        default_code: Optional[int] = None,
+    ):
+        super().__init__(env)
+        self.action_codes = action_codes
+        self.default_code = default_code
+
+    # The wrapped env rebinds or mutates these, so forward them instead of
+    # letting EnvWrapper copy them once.
+    agents = _forward_to_env("agents")
+    possible_agents = _forward_to_env("possible_agents")
+    agent_selector = _forward_to_env("agent_selector")
+    terminations = _forward_to_env("terminations")
+    truncations = _forward_to_env("truncations")
+    rewards = _forward_to_env("rewards")
+    infos = _forward_to_env("infos")
+    shared_memory = _forward_to_env("shared_memory")
+    global_context = _forward_to_env("global_context")
+
+    def encode(self, action: str) -> int:
+        code = self.action_codes.get(action, self.default_code)
+        if code is None:
+            raise ValueError(f"Unknown action: {action}")
+        return code
+
+    def step(self, actions: Dict[str, str]) -> Tuple[
+        Dict[str, str],
+        Dict[str, float],
+        Dict[str, bool],
+        Dict[str, bool],
+        Dict[str, dict],
+    ]:
+        return self.env.step(self._encode_actions(actions))
+
+    def step_copy(self, actions: Dict[str, str]) -> Tuple[
+        Dict[str, str],
+        Dict[str, float],
+        Dict[str, bool],
+        Dict[str, bool],
+        Dict[str, dict],
+    ]:
+        return self.env.step_copy(self._encode_actions(actions))
+
+    def _encode_actions(self, actions: Dict[str, str]) -> Dict[str, int]:
+        return {agent: self.encode(action) for agent, action in actions.items()}
+
+    def reset(
+        self, seed: Optional[int] = None
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        return self.env.reset(seed=seed)
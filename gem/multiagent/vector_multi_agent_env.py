@@ -0,0 +1,411 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Vectorized execution of multiple multi-agent environments."""
+
+import ctypes
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from gem.core import Env
+from gem.multiagent.multi_agent_env import ActionType, MultiAgentEnv
+from gem.vector.vector_env import ArrayType, AutoresetMode
+
+AgentIndex = int
+MultiAgentActType = Dict[str, ActionType]
+MultiAgentStepType = Tuple[
+    Dict[str, str],
+    Dict[str, float],
+    Dict[str, bool],
+    Dict[str, bool],
+    Dict[str, dict],
+]
+
+_NP_TO_CT = {
+    np.dtype(np.float64): ctypes.c_double,
+    np.dtype(np.bool_): ctypes.c_bool,
+}
+
+
+def step_reset_multi_agent_env(
+    actions: MultiAgentActType,
+    env: MultiAgentEnv,
+    autoreset_mode: AutoresetMode,
+    autoreset_env: bool,
+) -> MultiAgentStepType:
+    if autoreset_mode == AutoresetMode.NEXT_STEP:
+        if autoreset_env:
+            obs, infos = env.reset()
+            rewards, terminations, truncations = {}, {}, {}
+        else:
+            obs, rewards, terminations, truncations, infos = env.step(actions)
+    elif autoreset_mode == AutoresetMode.SAME_STEP:
+        obs, rewards, terminations, truncations, infos = env.step(actions)
+        if not env.agents:
+            obs, infos = env.reset()
+    else:
+        raise ValueError
+    return obs, rewards, terminations, truncations, infos
+
+
+def write_agent_row(
+    agent_idx: Dict[str, AgentIndex],
+    reward_row: np.ndarray,
+    termination_row: np.ndarray,
+    truncation_row: np.ndarray,
+    rewards: Dict[str, float],
+    terminations: Dict[str, bool],
+    truncations: Dict[str, bool],
+):
+    reward_row.fill(0.0)
+    termination_row.fill(False)
+    truncation_row.fill(False)
+    for agent, reward in rewards.items():
+        reward_row[agent_idx[agent]] = reward
+    for agent, terminated in terminations.items():
+        termination_row[agent_idx[agent]] = terminated
+    for agent, truncated in truncations.items():
+        truncation_row[agent_idx[agent]] = truncated
+
+
+class VectorMultiAgentEnv(Env):
+    """Batches several :class:`MultiAgentEnv` instances sharing the same agents.
+
+    Per-agent rewards, terminations and truncations are written into
+    preallocated ``(num_envs, num_agents)`` arrays, where column ``j`` belongs to
+    ``possible_agents[j]``. Observations and infos stay per-env dicts. An env is
+    reset once all of its agents are done, following ``autoreset_mode``.
+    """
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], MultiAgentEnv]],
+        autoreset_mode: Union[str, AutoresetMode] = AutoresetMode.SAME_STEP,
+    ) -> None:
+        super().__init__()
+        self.env_fns = env_fns
+        self.num_envs = len(env_fns)
+        self.autoreset_mode = AutoresetMode(autoreset_mode)
+
+        self.possible_agents: List[str] = self._make_envs()
+        self.num_agents = len(self.possible_agents)
+        # Built from the public spec so wrapped sub-environments work too.
+        self._agent_idx: Dict[str, AgentIndex] = {
+            agent: i for i, agent in enumerate(self.possible_agents)
+        }
+
+        # Initialize attributes used in `step` and `reset`
+        shape = (self.num_envs, self.num_agents)
+        self._env_obs: List[Dict[str, str]] = [{} for _ in range(self.num_envs)]
+        self._rewards = self._alloc_buffer("rewards", shape, np.float64)
+        self._terminations = self._alloc_buffer("terminations", shape, np.bool_)
+        self._truncations = self._alloc_buffer("truncations", shape, np.bool_)
+        self._env_infos: List[Dict[str, dict]] = [{} for _ in range(self.num_envs)]
+        self._autoreset_envs = np.zeros((self.num_envs,), dtype=np.bool_)
+
+    def _make_envs(self) -> List[str]:
+        """Creates the sub-environments and returns their shared possible_agents."""
+        self.envs = [env_fn() for env_fn in self.env_fns]
+        possible_agents = list(self.envs[0].possible_agents)
+        for env in self.envs[1:]:
+            if list(env.possible_agents) != possible_agents:
+                raise ValueError(
+                    "All sub-environments must share the same possible_agents"
+                )
+        return possible_agents
+
+    def _alloc_buffer(
+        self, name: str, shape: Tuple[int, ...], dtype: type
+    ) -> np.ndarray:
+        return np.zeros(shape, dtype=dtype)
+
+    def _write_result(self, i: int, result: MultiAgentStepType):
+        obs, rewards, terminations, truncations, infos = result
+        self._env_obs[i] = obs
+        self._env_infos[i] = infos
+        write_agent_row(
+            self._agent_idx,
+            self._rewards[i],
+            self._terminations[i],
+            self._truncations[i],
+            rewards,
+            terminations,
+            truncations,
+        )
+        self._autoreset_envs[i] = not self.envs[i].agents
+
+    def _step_envs(self, actions: Dict[int, MultiAgentActType]):
+        raise NotImplementedError
+
+    def _reset_envs(self, seed: Sequence[Optional[int]]):
+        for i, (env, single_seed) in enumerate(zip(self.envs, seed)):
+            self._env_obs[i], self._env_infos[i] = env.reset(seed=single_seed)
+
+    def step(
+        self,
+        actions: Union[Sequence[MultiAgentActType], Dict[int, MultiAgentActType]],
+    ) -> Tuple[
+        Sequence[Dict[str, str]],
+        ArrayType,
+        ArrayType,
+        ArrayType,
+        Sequence[Dict[str, dict]],
+    ]:
+        if isinstance(actions, Sequence):
+            assert len(actions) == self.num_envs
+            actions = {i: action for i, action in enumerate(actions)}
+
+        active_env_indices = list(actions.keys())
+        self._step_envs(actions)
+
+        return (
+            [deepcopy(self._env_obs[i]) for i in active_env_indices],
+            self._rewards[active_env_indices],
+            self._terminations[active_env_indices],
+            self._truncations[active_env_indices],
+            [deepcopy(self._env_infos[i]) for i in active_env_indices],
+        )
+
+    def reset(
+        self, seed: Optional[Union[int, Sequence[int]]] = None
+    ) -> Tuple[Sequence[Dict[str, str]], Sequence[Dict[str, Any]]]:
+        if seed is None:
+            seed = [None for _ in range(self.num_envs)]
+        elif isinstance(seed, int):
+            seed = [seed + i for i in range(self.num_envs)]
+        assert (
+            len(seed) == self.num_envs
+        ), f"If seeds are passed as a list the length must match num_envs={self.num_envs} but got length={len(seed)}."
+
+        self._reset_envs(seed)
+
+        self._rewards.fill(0.0)
+        self._terminations.fill(False)
+        self._truncations.fill(False)
+        self._autoreset_envs.fill(False)
+
+        return deepcopy(self._env_obs), deepcopy(self._env_infos)
+
+
+class SyncVectorMultiAgentEnv(VectorMultiAgentEnv):
+    def _step_envs(self, actions: Dict[int, MultiAgentActType]):
+        for i, action in actions.items():
+            result = step_reset_multi_agent_env(
+                action, self.envs[i], self.autoreset_mode, self._autoreset_envs[i]
+            )
+            self._write_result(i, result)
+
+
+class AsyncVectorMultiAgentEnv(VectorMultiAgentEnv):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.thread_pool_executer = ThreadPoolExecutor(max_workers=self.num_envs)
+
+    def _step_envs(self, actions: Dict[int, MultiAgentActType]):
+        results = self.thread_pool_executer.map(
+            lambda args: step_reset_multi_agent_env(*args),
+            [
+                (action, self.envs[i], self.autoreset_mode, self._autoreset_envs[i])
+                for i, action in actions.items()
+            ],
+        )
+        for i, result in zip(actions.keys(), results):
+            self._write_result(i, result)
+
+
+def _subproc_worker(
+    index: int,
+    env_fn: Callable[[], MultiAgentEnv],
+    remote,
+    parent_remote,
+    shared_buffers: Dict[str, Any],
+    shape: Tuple[int, int],
+    autoreset_mode: AutoresetMode,
+    agent_idx: Dict[str, AgentIndex],
+):
+    parent_remote.close()
+    buffers = {
+        name: np.frombuffer(raw, dtype=dtype).reshape(shape)[index]
+        for name, (raw, dtype) in shared_buffers.items()
+    }
+    try:
+        env = env_fn()
+    except Exception as e:
+        remote.send((False, e))
+        remote.close()
+        return
+
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "close":
+                break
+            # Report errors back and keep serving, like the in-process backends.
+            try:
+                if cmd == "step":
+                    actions, autoreset_env = data
+                    obs, rewards, terminations, truncations, infos = (
+                        step_reset_multi_agent_env(
+                            actions, env, autoreset_mode, autoreset_env
+                        )
+                    )
+                    write_agent_row(
+                        agent_idx,
+                        buffers["rewards"],
+                        buffers["terminations"],
+                        buffers["truncations"],
+                        rewards,
+                        terminations,
+                        truncations,
+                    )
+                    remote.send((True, (obs, infos, not env.agents)))
+                elif cmd == "reset":
+                    obs, infos = env.reset(seed=data)
+                    remote.send((True, (obs, infos)))
+                elif cmd == "possible_agents":
+                    remote.send((True, list(env.possible_agents)))
+                else:
+                    raise ValueError(f"Unknown command: {cmd}")
+            except Exception as e:
+                remote.send((False, e))
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        remote.close()
+
+
+class SubprocVectorMultiAgentEnv(VectorMultiAgentEnv):
+    """Runs each sub-environment in its own process.
+
+    Rewards, terminations and truncations live in shared memory indexed by
+    ``(env index, agent index)``: workers write their row in place and only send
+    observations, infos and a done flag back through the pipe. With the ``spawn``
+    start method, ``env_fns`` must be picklable.
+    """
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], MultiAgentEnv]],
+        autoreset_mode: Union[str, AutoresetMode] = AutoresetMode.SAME_STEP,
+        context: Optional[str] = None,
+    ) -> None:
+        self._ctx = mp.get_context(context)
+        self._shared_buffers: Dict[str, Any] = {}
+        super().__init__(env_fns, autoreset_mode)
+
+        shape = (self.num_envs, self.num_agents)
+        self._remotes, self._processes = [], []
+        for i, env_fn in enumerate(self.env_fns):
+            remote, work_remote = self._ctx.Pipe()
+            process = self._ctx.Process(
+                target=_subproc_worker,
+                args=(
+                    i,
+                    env_fn,
+                    work_remote,
+                    remote,
+                    self._shared_buffers,
+                    shape,
+                    self.autoreset_mode,
+                    self._agent_idx,
+                ),
+                daemon=True,
+            )
+            process.start()
+            work_remote.close()
+            self._remotes.append(remote)
+            self._processes.append(process)
+
+        for remote in self._remotes:
+            remote.send(("possible_agents", None))
+        worker_agents = []
+        try:
+            self._recv_all(
+                range(self.num_envs), lambda i, agents: worker_agents.append(agents)
+            )
+        except Exception:
+            self.close()
+            raise
+        if any(agents != self.possible_agents for agents in worker_agents):
+            self.close()
+            raise ValueError("All sub-environments must share the same possible_agents")
+
+    def _make_envs(self) -> List[str]:
+        # Only probe the agent spec here; the real envs are built in the workers.
+        return list(self.env_fns[0]().possible_agents)
+
+    def _alloc_buffer(
+        self, name: str, shape: Tuple[int, ...], dtype: type
+    ) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        raw = self._ctx.RawArray(_NP_TO_CT[dtype], int(np.prod(shape)))
+        self._shared_buffers[name] = (raw, dtype)
+        return np.frombuffer(raw, dtype=dtype).reshape(shape)
+
+    def _recv_all(self, indices: Iterable[int], on_result: Callable[[int, Any], None]):
+        """Reads one reply per worker in ``indices``, passing results to ``on_result``.
+
+        Every reply is read before the first worker error is re-raised, so no
+        stale reply is left in a pipe for the next command.
+        """
+        error = None
+        for i in indices:
+            success, result = self._remotes[i].recv()
+            if success:
+                on_result(i, result)
+            elif error is None:
+                error = result
+        if error is not None:
+            raise error
+
+    def _step_envs(self, actions: Dict[int, MultiAgentActType]):
+        for i, action in actions.items():
+            self._remotes[i].send(("step", (action, bool(self._autoreset_envs[i]))))
+        self._recv_all(actions.keys(), self._write_step_reply)
+
+    def _write_step_reply(self, i: int, reply: Tuple[Dict, Dict, bool]):
+        self._env_obs[i], self._env_infos[i], self._autoreset_envs[i] = reply
+
+    def _reset_envs(self, seed: Sequence[Optional[int]]):
+        for remote, single_seed in zip(self._remotes, seed):
+            remote.send(("reset", single_seed))
+        self._recv_all(range(self.num_envs), self._write_reset_reply)
+
+    def _write_reset_reply(self, i: int, reply: Tuple[Dict, Dict]):
+        self._env_obs[i], self._env_infos[i] = reply
+
+    def close(self):
+        for remote, process in zip(self._remotes, self._processes):
+            if process.is_alive():
+                try:
+                    remote.send(("close", None))
+                except (BrokenPipeError, EOFError):
+                    pass
+        for remote, process in zip(self._remotes, self._processes):
+            process.join()
+            remote.close()
@@ -0,0 +1,78 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+
+import numpy as np
+import pytest
+
+# Fall back to the CPU simulator when no GPU is configured; this only takes
+# effect if numba has not been imported yet.
+os.environ.setdefault("NUMBA_ENABLE_CUDASIM", "1")
+cuda = pytest.importorskip("numba.cuda")
+if not cuda.is_available():
+    pytest.skip(
+        "CUDA (or the numba simulator) is not available", allow_module_level=True
+    )
+
+from gem.multiagent.cuda_multi_agent_env import CudaMultiAgentEnv
+
+logger = logging.getLogger(__name__)
+
+GOOD, BAD, EXIT, NEUTRAL = 0, 1, 2, 3
+_REWARD_LUT = np.array([1.0, -1.0, 0.0, 0.0], dtype=np.float32)
+MAX_STEPS = 3
+
+
+@cuda.jit
+def _test_env_kernel(actions, state_in, state_out, rewards, terminations, truncations):
+    # Device port of SimpleTestEnv: state[..., 0] counts steps taken.
+    env = cuda.grid(1)
+    if env < actions.shape[0]:
+        for agent in range(actions.shape[1]):
+            code = actions[env, agent]
+            step = state_in[env, agent, 0] + 1
+            state_out[env, agent, 0] = step
+            rewards[env, agent] = _REWARD_LUT[code]
+            terminations[env, agent] = code == EXIT
+            truncations[env, agent] = step >= MAX_STEPS
+
+
+class CudaTestEnv(CudaMultiAgentEnv):
+    _step_kernel = _test_env_kernel
+
+
+def test_cuda_step():
+    env = CudaTestEnv(num_envs=2, num_agents=3)
+    state, _ = env.reset()
+    assert state.copy_to_host().sum() == 0
+
+    actions = cuda.to_device(np.array([[GOOD, BAD, EXIT], [NEUTRAL] * 3], np.int32))
+    for step in range(1, MAX_STEPS + 1):
+        state, rewards, terminations, truncations, _ = env.step(actions)
+        assert (state.copy_to_host()[..., 0] == step).all()
+
+    assert rewards.copy_to_host().tolist() == [[1.0, -1.0, 0.0], [0.0] * 3]
+    assert terminations.copy_to_host().tolist() == [[False, False, True], [False] * 3]
+    assert truncations.copy_to_host().all(), "Kernel should write truncations"
+
+    state, _ = env.reset()
+    assert not env.truncations.copy_to_host().any()
+    assert state.copy_to_host().sum() == 0
+    logger.info(f"Stepped {env.num_envs} envs on device")
+
+
+if __name__ == "__main__":
+    test_cuda_step()
@@ -0,0 +1,108 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import random
+
+import pytest
+
+jax = pytest.importorskip("jax")
+jnp = pytest.importorskip("jax.numpy")
+
+from gem.multiagent.functional_env import (
+    FunctionalEnvAdapter,
+    FunctionalMultiAgentEnv,
+    build_batched_rollout,
+    build_rollout,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CounterEnv(FunctionalMultiAgentEnv):
+    """Each agent adds its action to a counter; done once it reaches 3."""
+
+    possible_agents = ("agent_0", "agent_1")
+
+    def reset_fn(self, key):
+        pos = jnp.zeros(self.num_agents, dtype=jnp.int32)
+        return {"t": jnp.int32(0), "pos": pos}, pos
+
+    def step_fn(self, state, actions):
+        pos = state["pos"] + actions
+        t = state["t"] + 1
+        rewards = actions.astype(jnp.float32)
+        terminations = pos >= 3
+        truncations = jnp.full(self.num_agents, t >= 10)
+        return {"t": t, "pos": pos}, pos, rewards, terminations, truncations, {}
+
+
+def always_one(key, obs):
+    return jnp.ones(obs.shape, dtype=jnp.int32)
+
+
+def test_rollout_shapes_and_autoreset():
+    env = CounterEnv()
+    state, (obs, rewards, term, trunc, _) = build_rollout(env, 7, always_one)(
+        jax.random.PRNGKey(0)
+    )
+
+    assert obs.shape == rewards.shape == term.shape == trunc.shape == (7, 2)
+    # Episodes last 3 steps; the terminal step records the final observation.
+    assert obs[:, 0].tolist() == [1, 2, 3, 1, 2, 3, 1]
+    assert term[:, 0].tolist() == [False, False, True] * 2 + [False]
+    assert int(state["pos"][0]) == 1
+
+    _, (obs, *_) = build_rollout(env, 5, always_one, autoreset=False)(
+        jax.random.PRNGKey(0)
+    )
+    assert obs[:, 0].tolist() == [1, 2, 3, 4, 5], "No reset without autoreset"
+
+
+def test_batched_rollout_shapes():
+    env = CounterEnv()
+    keys = jax.random.split(jax.random.PRNGKey(0), 8)
+    state, (obs, rewards, term, trunc, _) = build_batched_rollout(env, 4, always_one)(
+        keys
+    )
+
+    assert obs.shape == rewards.shape == (8, 4, 2)
+    assert state["pos"].shape == (8, 2)
+
+
+def test_adapter_step_and_termination():
+    env = FunctionalEnvAdapter(CounterEnv())
+    obs, _ = env.reset()
+    assert obs == {"agent_0": 0, "agent_1": 0}
+
+    for step in range(3):
+        obs, rewards, term, trunc, _ = env.step({agent: 1 for agent in env.agents})
+        assert rewards == {"agent_0": 1.0, "agent_1": 1.0}
+        assert obs["agent_0"] == step + 1
+
+    assert term == {"agent_0": True, "agent_1": True}
+    assert not env.agents, "Terminated agents should be removed"
+
+    # Seeded resets also seed the global RNGs, like every other MultiAgentEnv.
+    env.reset(seed=5)
+    first = random.random()
+    env.reset(seed=5)
+    assert random.random() == first
+    logger.info(f"Adapter finished with observations {obs}")
+
+
+if __name__ == "__main__":
+    test_rollout_shapes_and_autoreset()
+    test_batched_rollout_shapes()
+    test_adapter_step_and_termination()
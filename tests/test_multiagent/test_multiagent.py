@@ -13,32 +13,137 @@
 # limitations under the License.
 
 import logging
+import numbers
 import random
-from typing import Dict, Tuple
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple, Union
 
 import fire
+import numpy as np
+import pytest
+
+from gem.multiagent import (
+    AgentSelector,
+    AsyncVectorMultiAgentEnv,
+    MultiAgentEnv,
+    StringActionAdapter,
+    SubprocVectorMultiAgentEnv,
+    SyncVectorMultiAgentEnv,
+)
+
+try:
+    from numba import njit
+except ImportError:
+
+    def njit(*args, **kwargs):
+        return lambda fn: fn
 
-from gem.multiagent import AgentSelector, MultiAgentEnv
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+_OBS_TMPL = "Step {}: Observation for {}".format
+
+GOOD, BAD, EXIT, NEUTRAL = 0, 1, 2, 3
+_REWARD_LUT = np.array([1.0, -1.0, 0.0, 0.0], dtype=np.float32)
+
+
+# Read-only so it stays safe to share across vector-env threads.
+_ACTION_CODES: Mapping[str, int] = MappingProxyType(
+    {"good": GOOD, "bad": BAD, "exit": EXIT}
+)
+
+
+def _classify_action(action: str) -> int:
+    if "good" in action:
+        return GOOD
+    if "bad" in action:
+        return BAD
+    if action == "exit":
+        return EXIT
+    return NEUTRAL
+
+
+def _encode_action(action: Union[str, int]) -> int:
+    if isinstance(action, (bool, np.bool_)):
+        raise ValueError(f"Boolean action is not an action code: {action}")
+    if isinstance(action, numbers.Integral):
+        # Codes index _REWARD_LUT, so reject them before they reach the kernel.
+        code = int(action)
+        if not 0 <= code < len(_REWARD_LUT):
+            raise ValueError(f"Unknown action code: {action}")
+        return code
+    # Exact names skip the substring checks; anything else (e.g. "good_action_0")
+    # pays for the lookup and then falls back to _classify_action.
+    code = _ACTION_CODES.get(action)
+    return _classify_action(action) if code is None else code
+
+
+@njit(cache=True)
+def _reward_exit_kernel(
+    codes: np.ndarray, state: Optional[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    rewards = np.empty(codes.size, np.float32)
+    exits = np.empty(codes.size, np.bool_)
+    for i in range(codes.size):
+        rewards[i] = _REWARD_LUT[codes[i]]
+        exits[i] = codes[i] == EXIT
+    return rewards, exits
+
+
+def pre_compile():
+    """Warm up the JIT kernel so the first step does not pay for compilation."""
+    _reward_exit_kernel(np.array([GOOD, BAD, EXIT, NEUTRAL], dtype=np.int64), None)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _warm_kernel():
+    pre_compile()
+
 
 class SimpleTestEnv(MultiAgentEnv):
     """Simple test environment for multi-agent testing."""
 
-    def __init__(self, mode: str = "sequential", num_agents: int = 3):
-        super().__init__()
+    __slots__ = (
+        "step_count",
+        "max_steps",
+        "_out_obs",
+        "_out_rew",
+        "_out_term",
+        "_out_trunc",
+    )
+
+    _step_kernel = _reward_exit_kernel
+
+    def __init__(
+        self,
+        mode: str = "sequential",
+        num_agents: int = 3,
+        autoreset_mode: Optional[str] = None,
+    ):
+        super().__init__(autoreset_mode=autoreset_mode)
 
         self.possible_agents = [f"agent_{i}" for i in range(num_agents)]
         self.agent_selector = AgentSelector(self.possible_agents, mode=mode)
         self.step_count = 0
         self.max_steps = 10
 
+        # Output dicts reused by every step; see MultiAgentEnv.step_copy.
+        self._out_obs: Dict[str, str] = {}
+        self._out_rew: Dict[str, float] = {}
+        self._out_term: Dict[str, bool] = {}
+        self._out_trunc: Dict[str, bool] = {}
+
+    def reset(
+        self, seed: Optional[int] = None
+    ) -> Tuple[Dict[str, str], Dict[str, dict]]:
+        self.step_count = 0
+        return super().reset(seed)
+
     def observe(self, agent: str) -> str:
-        return f"Step {self.step_count}: Observation for {agent}"
+        return _OBS_TMPL(self.step_count, agent)
 
     def _process_actions(self, actions: Dict[str, str]) -> Tuple[
         Dict[str, str],
@@ -47,29 +152,31 @@ class SimpleTestEnv(MultiAgentEnv):
         Dict[str, bool],
         Dict[str, dict],
     ]:
-        observations = {}
-        rewards = {}
+        observations, rewards = self._out_obs, self._out_rew
+        observations.clear()
+        rewards.clear()
 
+        # Single pass over the actions: encode and observe.
+        codes = {}
         for agent, action in actions.items():
+            codes[agent] = _encode_action(action)
             observations[agent] = self.observe(agent)
 
-            if "good" in action:
-                rewards[agent] = 1.0
-            elif "bad" in action:
-                rewards[agent] = -1.0
-            else:
-                rewards[agent] = 0.0
-
-            if action == "exit":
-                self.terminations[agent] = True
+        self._run_step_kernel(codes, rewards)
 
         self.step_count += 1
 
         if self.step_count >= self.max_steps:
-            for agent in self.agents:
-                self.truncations[agent] = True
+            # Update in place so held state() views see the truncation.
+            self.truncations.update(self._true_template)
 
-        return observations, rewards, self.terminations, self.truncations, self.infos
+        # Snapshot the status dicts: dead agents are deleted from the live ones.
+        terminations, truncations = self._out_term, self._out_trunc
+        terminations.clear()
+        terminations.update(self.terminations)
+        truncations.clear()
+        truncations.update(self.truncations)
+        return observations, rewards, terminations, truncations, self.infos
 
 
 def test_sequential_mode():
@@ -245,6 +352,36 @@ def test_get_active_states():
     return env_seq, env_par
 
 
+def test_state_views():
+    """Test state() returns live read-only views unless a copy is requested."""
+    logger.info("Testing state views")
+
+    env = SimpleTestEnv(mode="parallel")
+    env.reset()
+
+    view = env.state()
+    snapshot = env.state(copy_on_read=True)
+    assert view["agents"] == ("agent_0", "agent_1", "agent_2")
+
+    try:
+        view["terminations"]["agent_0"] = True
+        logger.error("Should not be able to write through a state view")
+    except TypeError as e:
+        logger.info(f"Correctly rejected write through view: {e}")
+
+    env.step({"agent_0": "good", "agent_1": "normal", "agent_2": "normal"})
+    assert view["cumulative_rewards"]["agent_0"] == 1.0, "View should be live"
+    assert snapshot["cumulative_rewards"]["agent_0"] == 0.0, "Copy should not"
+
+    while env.agents:
+        env.step({agent: "normal" for agent in env.agents})
+        assert dict(view["truncations"]) == env.truncations, "View went stale"
+        assert dict(view["terminations"]) == env.terminations, "View went stale"
+    assert env.step_count == env.max_steps, "Loop should cross max_steps"
+
+    return env
+
+
 def test_observe_method():
     """Test observe method directly."""
     logger.info("Testing observe method")
@@ -321,6 +458,291 @@ def test_dead_agent_removal():
     return env
 
 
+def test_agents_set_tracking():
+    """Test the cached agent set stays in sync with the agent list."""
+    logger.info("Testing Agent Set Tracking")
+
+    env = SimpleTestEnv(mode="parallel")
+    assert env._agent_to_idx == {"agent_0": 0, "agent_1": 1, "agent_2": 2}
+    possible_agents, agent_to_idx = env.possible_agents, env._agent_to_idx
+    env.reset()
+    env.reset()
+    assert env.possible_agents is possible_agents, "reset() should not rebind"
+    assert env._agent_to_idx is agent_to_idx
+    assert env._agents_set == set(env.agents)
+
+    env.step({"agent_0": "normal", "agent_1": "exit", "agent_2": "normal"})
+    assert env._agents_set == {"agent_0", "agent_2"}
+
+    env.add_agent("agent_3")
+    assert env._agents_set == set(env.agents)
+
+    env.remove_agent("agent_0")
+    assert env._agents_set == set(env.agents)
+    logger.info(f"Agent set after updates: {sorted(env._agents_set)}")
+
+    return env
+
+
+def test_reward_exit_kernel():
+    """Test the (optionally JIT-compiled) reward/exit kernel."""
+    logger.info("Testing Reward/Exit Kernel")
+
+    codes = np.array([GOOD, BAD, EXIT, NEUTRAL, GOOD], dtype=np.int64)
+    rewards, exits = _reward_exit_kernel(codes, None)
+
+    assert rewards.tolist() == [1.0, -1.0, 0.0, 0.0, 1.0]
+    assert exits.tolist() == [False, False, True, False, False]
+
+    empty_rewards, empty_exits = _reward_exit_kernel(np.empty(0, dtype=np.int64), None)
+    assert empty_rewards.size == 0 and empty_exits.size == 0
+
+    # Misses are classified on every call, so repeats must give the same code.
+    for _ in range(2):
+        assert [_encode_action(a) for a in ("good", "good move", "bad_1", "wait")] == [
+            GOOD,
+            GOOD,
+            BAD,
+            NEUTRAL,
+        ]
+
+    return rewards, exits
+
+
+def test_vector_env():
+    """Test batching several environments into stacked reward/done arrays."""
+    logger.info("Testing Vectorized Multi-Agent Env")
+
+    for vec_cls in (
+        SyncVectorMultiAgentEnv,
+        AsyncVectorMultiAgentEnv,
+        SubprocVectorMultiAgentEnv,
+    ):
+        vec_env = vec_cls([lambda: SimpleTestEnv(mode="parallel")] * 2)
+        obs, infos = vec_env.reset(seed=0)
+        assert len(obs) == 2
+        obs, infos = vec_env.reset(seed=[3, 4])
+        assert len(obs) == 2 and set(obs[0]) == set(vec_env.possible_agents)
+
+        actions = [
+            {"agent_0": "good", "agent_1": "exit", "agent_2": "bad"},
+            {"agent_0": "bad", "agent_1": "good", "agent_2": "good"},
+        ]
+        obs, rewards, term, trunc, infos = vec_env.step(actions)
+        assert rewards.shape == (2, 3)
+        assert rewards.tolist() == [[1.0, 0.0, -1.0], [-1.0, 1.0, 1.0]]
+        assert term.tolist() == [[False, True, False], [False, False, False]]
+        assert not trunc.any()
+
+        obs, rewards, term, trunc, infos = vec_env.step(
+            {1: {"agent_0": "good", "agent_1": "good", "agent_2": "good"}}
+        )
+        assert rewards.shape == (1, 3) and rewards.sum() == 3.0
+
+        alive = [{"agent_0", "agent_2"}, set(vec_env.possible_agents)]
+        truncated = False
+        for _ in range(10):
+            obs, rewards, term, trunc, infos = vec_env.step(
+                [{agent: "neutral" for agent in agents} for agents in alive]
+            )
+            for i, agents in enumerate(alive):
+                done = {
+                    agent
+                    for j, agent in enumerate(vec_env.possible_agents)
+                    if term[i, j] or trunc[i, j]
+                }
+                truncated = truncated or trunc[i].any()
+                # SAME_STEP autoreset: a finished env comes back with all agents.
+                alive[i] = agents - done or set(obs[i])
+        assert truncated, "Envs should truncate after max_steps"
+        assert all(agents == set(vec_env.possible_agents) for agents in alive)
+
+        vec_env.reset()
+        neutral = dict.fromkeys(vec_env.possible_agents, "neutral")
+        for episode in range(2):
+            for step in range(1, 11):
+                obs, rewards, term, trunc, infos = vec_env.step([neutral] * 2)
+                assert trunc.all() == (step == 10), f"Episode {episode} length"
+
+        # A bad action dict raises, but the backend keeps working afterwards.
+        try:
+            vec_env.step([neutral, {"agent_0": "good"}])
+        except ValueError as e:
+            logger.info(f"{vec_cls.__name__} rejected bad actions: {e}")
+        else:
+            raise AssertionError("Should have raised ValueError for missing actions")
+        obs, rewards, term, trunc, infos = vec_env.step([neutral] * 2)
+        assert obs[0]["agent_0"] == "Step 1: Observation for agent_0"
+        assert obs[1]["agent_0"] == "Step 0: Observation for agent_0"
+
+        adapted_env = vec_cls(
+            [
+                lambda: StringActionAdapter(
+                    SimpleTestEnv(mode="parallel"), {"good": GOOD, "bad": BAD}
+                )
+            ]
+            * 2
+        )
+        adapted_env.reset()
+        obs, rewards, term, trunc, infos = adapted_env.step(
+            [dict.fromkeys(adapted_env.possible_agents, "good")] * 2
+        )
+        assert rewards.tolist() == [[1.0] * 3] * 2
+        if isinstance(vec_env, SubprocVectorMultiAgentEnv):
+            vec_env.close()
+            adapted_env.close()
+        logger.info(f"{vec_cls.__name__}: rewards={rewards.tolist()}")
+
+    return vec_env
+
+
+def test_step_copy():
+    """Test reused step outputs versus step_copy snapshots."""
+    logger.info("Testing step_copy")
+
+    env = SimpleTestEnv(mode="parallel")
+    env.reset()
+
+    _, rewards, _, _, _ = env.step({agent: "good" for agent in env.agents})
+    _, copied, _, _, _ = env.step_copy({agent: "bad" for agent in env.agents})
+    assert rewards is env._out_rew, "step() should return the reused dict"
+    assert rewards == copied == {"agent_0": -1.0, "agent_1": -1.0, "agent_2": -1.0}
+
+    env.step({agent: "good" for agent in env.agents})
+    assert copied["agent_0"] == -1.0, "step_copy() result should not change"
+
+    return env
+
+
+def test_autoreset():
+    """Test the env resets itself once every agent is done."""
+    logger.info("Testing Autoreset")
+
+    env = SimpleTestEnv(mode="parallel", autoreset_mode="SameStep")
+    env.reset()
+    obs, rewards, term, trunc, info = env.step(
+        {"agent_0": "exit", "agent_1": "exit", "agent_2": "good"}
+    )
+    assert "__final__" not in info, "Should not reset while agent_2 is alive"
+
+    obs, rewards, term, trunc, info = env.step({"agent_2": "exit"})
+    assert info["__final__"]["observation"].keys() == {"agent_2"}
+    assert info["__final__"]["info"] == {"agent_2": {}}
+    assert rewards == {"agent_2": 0.0} and term["agent_2"]
+    assert set(obs) == set(env.agents) == set(env.possible_agents)
+
+    finished = []
+    for step in range(1, env.max_steps + 1):
+        obs, rewards, term, trunc, info = env.step(
+            {agent: "neutral" for agent in env.agents}
+        )
+        if "__final__" in info:
+            finished.append(step)
+    assert finished == [env.max_steps], "Second episode should run max_steps"
+    assert all(trunc.values())
+
+    env = SimpleTestEnv(mode="parallel", autoreset_mode="NextStep")
+    env.reset()
+    env.step({agent: "exit" for agent in env.agents})
+    assert not env.agents, "NEXT_STEP should keep the finished episode visible"
+
+    obs, rewards, term, trunc, info = env.step({})
+    assert set(obs) == set(env.possible_agents)
+    assert rewards == dict.fromkeys(env.possible_agents, 0.0)
+    assert not any(term.values()) and not any(trunc.values())
+
+    return env
+
+
+def test_integer_actions():
+    """Test integer action codes, array actions and the string adapter."""
+    logger.info("Testing Integer Actions")
+
+    env = SimpleTestEnv(mode="parallel")
+    env.reset()
+
+    _, rewards, _, _, _ = env.step({"agent_0": GOOD, "agent_1": BAD, "agent_2": 3})
+    assert rewards == {"agent_0": 1.0, "agent_1": -1.0, "agent_2": 0.0}
+
+    _, rewards, term, _, _ = env.step(np.array([BAD, EXIT, GOOD], dtype=np.int32))
+    assert rewards == {"agent_0": -1.0, "agent_1": 0.0, "agent_2": 1.0}
+    assert term["agent_1"] and "agent_1" not in env.agents
+
+    for bad_actions in (
+        {"agent_0": 7, "agent_2": GOOD},
+        {"agent_0": 300, "agent_2": GOOD},
+        {"agent_0": True, "agent_2": GOOD},
+        {"agent_0": np.int64(7), "agent_2": GOOD},
+        np.array([GOOD, GOOD, GOOD], dtype=np.float32),
+        np.array([GOOD, GOOD], dtype=np.int32),
+    ):
+        try:
+            env.step(bad_actions)
+        except ValueError as e:
+            logger.info(f"Correctly rejected {bad_actions!r}: {e}")
+        else:
+            raise AssertionError(f"Should have raised ValueError for {bad_actions!r}")
+
+    _, rewards, _, _, _ = env.step({"agent_0": np.int64(GOOD), "agent_2": np.int8(BAD)})
+    assert rewards == {"agent_0": 1.0, "agent_2": -1.0}
+    assert type(rewards["agent_0"]) is float
+
+    env.add_agent("agent_3")
+    try:
+        env.step(np.array([GOOD, GOOD, GOOD], dtype=np.int32))
+    except ValueError as e:
+        logger.info(f"Correctly rejected array action for runtime agent: {e}")
+    else:
+        raise AssertionError("Runtime agents have no array slot")
+    _, rewards, _, _, _ = env.step({"agent_0": GOOD, "agent_2": BAD, "agent_3": GOOD})
+    assert rewards == {"agent_0": 1.0, "agent_2": -1.0, "agent_3": 1.0}
+
+    env.remove_agent("agent_3")
+    env.reset()
+    assert env.agents == env.possible_agents == ["agent_0", "agent_1", "agent_2"]
+
+    adapted = StringActionAdapter(
+        SimpleTestEnv(mode="parallel"),
+        {"good": GOOD, "bad": BAD, "exit": EXIT},
+        default_code=NEUTRAL,
+    )
+    adapted.reset()
+    _, rewards, _, _, _ = adapted.step(
+        {"agent_0": "good", "agent_1": "exit", "agent_2": "wait"}
+    )
+    assert rewards == {"agent_0": 1.0, "agent_1": 0.0, "agent_2": 0.0}
+    assert adapted.agents == ["agent_0", "agent_2"]
+    assert adapted.terminations == {"agent_0": False, "agent_2": False}
+    assert adapted.rewards is adapted.env.rewards
+
+    _, copied, _, _, _ = adapted.step_copy({"agent_0": "bad", "agent_2": "good"})
+    assert copied == {"agent_0": -1.0, "agent_2": 1.0}
+    adapted.reset()
+    adapted.broadcast_message("agent_0", "hi")
+    assert adapted.shared_memory == adapted.env.shared_memory != []
+
+    try:
+        StringActionAdapter(env, {"good": GOOD}).encode("jump")
+        logger.error("Should have raised ValueError for unknown action")
+    except ValueError as e:
+        logger.info(f"Correctly rejected unknown action: {e}")
+
+    return adapted
+
+
+def test_reset_seed():
+    """Test reset(seed=...) seeds the global RNGs reproducibly."""
+    logger.info("Testing reset seeding")
+
+    env = SimpleTestEnv(mode="parallel")
+    env.reset(seed=3)
+    first = random.random()
+    env.reset(seed=3)
+    assert random.random() == first, "Same seed should give the same draws"
+
+    return env
+
+
 def test_message_errors():
     """Test message sending error conditions."""
     logger.info("Testing Message Error Handling")
@@ -448,6 +870,7 @@ def test_all(verbose: bool = False):
     print("Running Multi-Agent Environment Tests")
     print("=" * 60)
 
+    pre_compile()
     test_sequential_mode()
     print()
 
@@ -466,6 +889,9 @@ def test_all(verbose: bool = False):
     test_get_active_states()
     print()
 
+    test_state_views()
+    print()
+
     test_observe_method()
     print()
 
@@ -475,6 +901,27 @@ def test_all(verbose: bool = False):
     test_dead_agent_removal()
     print()
 
+    test_agents_set_tracking()
+    print()
+
+    test_reward_exit_kernel()
+    print()
+
+    test_vector_env()
+    print()
+
+    test_reset_seed()
+    print()
+
+    test_step_copy()
+    print()
+
+    test_autoreset()
+    print()
+
+    test_integer_actions()
+    print()
+
     test_message_errors()
     print()
 